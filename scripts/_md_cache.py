@@ -0,0 +1,162 @@
+"""
+Content-Addressed Course Cache
+
+Purpose:
+- Skip re-parsing course Markdown files whose content has not changed
+- Persist built course data between runs under .cache/courses/
+
+Design Constraints:
+- Entries are keyed by a hash of the file content (plus a caller salt)
+- A changed file, parser, parser library, or programme definition
+  yields a new key; stale entries are never served, only evicted
+- Disk usage is bounded by an LRU cap on the number of entries
+- An optional mtime/size manifest lets callers skip reading unchanged files
+- Best-effort: an unusable cache directory disables caching with a
+  warning; it never fails the run
+
+Intent:
+- Make incremental runs cheap without changing any parser output
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+DEFAULT_MAX_ENTRIES = 256
+MANIFEST_FILENAME = "manifest.json"
+
+# Callers parse cache misses inline below this many files; starting a
+# process pool costs more than it saves on a handful of courses
+MIN_PARALLEL_FILES = 8
+
+
+class TokenCache:
+    """
+    Disk-backed LRU cache of pickled parse results.
+
+    Values must be picklable and must not be None (None signals a miss).
+    Any OSError on the cache directory disables the cache for the rest
+    of the run: lookups then miss and writes are skipped.
+    """
+
+    def __init__(self, cache_dir: Path, salt: bytes = b"", max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.salt = salt
+        self.max_entries = max_entries
+        self.enabled = True
+        self._lru: OrderedDict[str, None] = OrderedDict()
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Recency order (oldest first), seeded from file mtimes
+            entries = sorted(
+                self.cache_dir.glob("*.pkl"),
+                key=lambda p: p.stat().st_mtime_ns
+            )
+        except OSError as e:
+            self._disable(e)
+            return
+        self._lru.update((p.stem, None) for p in entries)
+
+    def _disable(self, err: OSError) -> None:
+        if self.enabled:
+            print(f"Warning: cache disabled ({self.cache_dir}): {err}", file=sys.stderr)
+        self.enabled = False
+        self._lru.clear()
+
+    def key_for(self, *parts) -> str:
+        # Parts may be str or any bytes-like object (bytes, mmap, ...)
+        h = hashlib.blake2b(self.salt, digest_size=16)
+        for part in parts:
+            h.update(part.encode("utf-8") if isinstance(part, str) else part)
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str):
+        if key not in self._lru:
+            return None
+
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except Exception:
+            # Missing or corrupt entry: treat as a miss and forget it
+            self._lru.pop(key, None)
+            path.unlink(missing_ok=True)
+            return None
+
+        self._lru.move_to_end(key)
+        try:
+            os.utime(path)  # persist recency for the next run
+        except OSError as e:
+            self._disable(e)
+        return value
+
+    def put(self, key: str, value) -> None:
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            with tmp.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            self._disable(e)
+            return
+
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        self._evict()
+
+    # -------------------------
+    # Stat manifest
+    # -------------------------
+    # Maps file name -> {"stat": [mtime_ns, size], "key": cache key} so a
+    # caller can skip reading files whose stat signature is unchanged.
+    # The manifest is tied to the salt; a different salt ignores it.
+
+    def read_manifest(self) -> dict:
+        if not self.enabled:
+            return {}
+        path = self.cache_dir / MANIFEST_FILENAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+        if data.get("salt") != self.salt.hex():
+            return {}
+        return data.get("files", {})
+
+    def write_manifest(self, files: dict) -> None:
+        if not self.enabled:
+            return
+        path = self.cache_dir / MANIFEST_FILENAME
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(
+                json.dumps({"salt": self.salt.hex(), "files": files}, indent=2),
+                encoding="utf-8"
+            )
+            os.replace(tmp, path)
+        except OSError as e:
+            self._disable(e)
+
+    def _evict(self) -> None:
+        while len(self._lru) > self.max_entries:
+            old, _ = self._lru.popitem(last=False)
+            try:
+                self._path(old).unlink(missing_ok=True)
+            except OSError as e:
+                self._disable(e)
+                return
@@ -0,0 +1,74 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled section scanner for read_courses.split_markdown_sections.
+
+Build in place (optional; read_courses falls back to pure Python):
+
+    cythonize -i scripts/_md_scan.pyx
+
+Contract (identical to read_courses._scan_sections_py):
+- Input is "\n"-normalised Markdown text
+- Returns raw (level, title, body) triples, PREAMBLE first
+- Fence runs (``` / ~~~, 3+ chars) toggle code blocks; only an identical
+  run closes the block
+- "#"+ followed by a space and a non-empty title starts a section,
+  except inside code blocks
+"""
+
+from cpython.unicode cimport PyUnicode_READ_CHAR, Py_UNICODE_ISSPACE
+
+
+def scan_sections(str md_text):
+    cdef Py_ssize_t n = len(md_text)
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t line_end, j, k, body_start = 0
+    cdef Py_UCS4 c0
+    cdef bint in_code_block = False
+    cdef Py_UCS4 fence_char = 0
+    cdef Py_ssize_t fence_len = 0
+    cdef Py_ssize_t current_level = 0
+    cdef str current_title = "__PREAMBLE__"
+    cdef str title
+    cdef list raw = []
+
+    while pos < n:
+        line_end = md_text.find("\n", pos)
+        if line_end < 0:
+            line_end = n
+
+        # Skip leading whitespace (mirrors str.lstrip)
+        j = pos
+        while j < line_end and Py_UNICODE_ISSPACE(PyUnicode_READ_CHAR(md_text, j)):
+            j += 1
+
+        if j < line_end:
+            c0 = PyUnicode_READ_CHAR(md_text, j)
+
+            if c0 == u'`' or c0 == u'~':
+                k = j
+                while k < line_end and PyUnicode_READ_CHAR(md_text, k) == c0:
+                    k += 1
+                if k - j >= 3:
+                    if not in_code_block:
+                        in_code_block = True
+                        fence_char = c0
+                        fence_len = k - j
+                    elif c0 == fence_char and k - j == fence_len:
+                        in_code_block = False
+
+            elif c0 == u'#' and not in_code_block:
+                k = j
+                while k < line_end and PyUnicode_READ_CHAR(md_text, k) == u'#':
+                    k += 1
+                if k < line_end and PyUnicode_READ_CHAR(md_text, k) == u' ':
+                    title = md_text[k + 1:line_end].strip()
+                    if title:
+                        raw.append((current_level, current_title, md_text[body_start:pos].strip()))
+                        current_level = k - j
+                        current_title = title
+                        body_start = line_end
+
+        pos = line_end + 1
+
+    raw.append((current_level, current_title, md_text[body_start:].strip()))
+    return raw
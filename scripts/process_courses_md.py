@@ -1,10 +1,19 @@
 # Implements: Syllabus DSL (see Syllabus_0DSL.md)
 from pathlib import Path
 from markdown_it import MarkdownIt
+import markdown_it
+import asyncio
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import hashlib
 from typing import NoReturn
 from fractions import Fraction
+from array import array
+
+from _md_cache import MIN_PARALLEL_FILES, TokenCache
 
 
 # -------------------------
@@ -61,8 +70,9 @@ POLICY_LIMITS = {
 #   }
 #
 # Articulation Matrix:
-#   dict[str, dict[str, Optional[int]]]
-#   -> CO → (PO/PSO/SO → 3|2|1|None)
+#   list[array('b')]
+#   -> row per CO (CO1 first), column per PO/PSO/SO → 3|2|1|-1
+#      (-1 encodes the DSL '-' / unmapped cell)
 #
 # NOTE:
 # Shapes are intentionally non-uniform.
@@ -71,6 +81,9 @@ POLICY_LIMITS = {
 # Get the directory where the current script lives (scripts/)
 current_dir = Path(__file__).parent
 
+# Built course data is cached here, keyed by file content
+CACHE_DIR = current_dir.parent / ".cache" / "courses"
+
 # -------------------------
 # Errors
 # -------------------------
@@ -99,6 +112,25 @@ def parse_markdown(text):
 # -------------------------
 
 CO_RE = re.compile(r"^CO\d+\s*:")
+
+# -------------------------
+# Outcome labels
+# -------------------------
+# Built once at import; courses slice these instead of formatting
+# "CO1", "PO1", ... per course. Larger counts fall back to formatting.
+MAX_PRECOMPUTED_LABELS = 32
+
+CO_LABELS = tuple(f"CO{i}" for i in range(1, MAX_PRECOMPUTED_LABELS + 1))
+PO_LABELS = tuple(f"PO{i}" for i in range(1, MAX_PRECOMPUTED_LABELS + 1))
+PSO_LABELS = tuple(f"PSO{i}" for i in range(1, MAX_PRECOMPUTED_LABELS + 1))
+SO_LABELS = tuple(f"SO{i}" for i in range(1, MAX_PRECOMPUTED_LABELS + 1))
+
+
+def outcome_labels(labels: tuple[str, ...], prefix: str, n: int) -> tuple[str, ...]:
+    if n <= len(labels):
+        return labels[:n]
+    return labels + tuple(f"{prefix}{i}" for i in range(len(labels) + 1, n + 1))
+
 # -------------------------
 # Section heading regexes (with hours)
 # -------------------------
@@ -117,6 +149,18 @@ X_HDR_RE = re.compile(
     r"^X-Activity\s*\(\s*(\d+)\s*Hours\s*\)$",
     re.IGNORECASE
 )
+
+# -------------------------
+# Course header regexes
+# -------------------------
+# Possessive quantifiers (Python 3.11+) stop the engine from
+# re-trying whitespace/digit splits on malformed metadata.
+LTPXC_RE = re.compile(
+    r"L\s*+-\s*+T\s*+-\s*+P\s*+-\s*+X\s*+-\s*+C\s*+:\s*+"
+    r"(\d++(?:\s*+-\s*+\d++){3}\s*+-\s*+\d++(?:\.\d++)?)",
+    re.IGNORECASE
+)
+
 def get_next_inline_content(tokens, start_idx, limit_idx=None):
     # Safely finds the next 'inline' token content without assuming its position.
     # Stops at structural boundaries.
@@ -134,6 +178,20 @@ def get_next_inline_content(tokens, start_idx, limit_idx=None):
             return tokens[j].content.strip(), j
     return None, limit_idx
 
+def build_heading_close_index(tokens):
+    # next_heading_close[i] is the index of the first 'heading_close'
+    # strictly after i (len(tokens) if none). Built once per course so
+    # heading seeks become a single lookup. Titles always sit directly
+    # after heading_open at every level; the table serves the unit and
+    # H3 seeks, which start from positions that need not be a heading.
+    next_heading_close = [0] * len(tokens)
+    last = len(tokens)
+    for i in range(len(tokens) - 1, -1, -1):
+        next_heading_close[i] = last
+        if tokens[i].type == "heading_close":
+            last = i
+    return next_heading_close
+
 def parse_ltpxc(ltpxc: str, file: str) -> tuple[int, int, int, int, Fraction]:
     try:
         parts = ltpxc.split("-")
@@ -183,11 +241,11 @@ def validate_colon_bullet(text, file):
 
     return topic, subtopics
 
-def tex_safe(text: str) -> str:
-    # Escapes standard LaTeX reserved characters
-    # Order matters: escape backslash first, then others
-    chars = {
-    '\\': r'\textbackslash{}',   # MUST be first conceptually
+# Escapes standard LaTeX reserved characters.
+# translate() maps each source character once, so the backslash rule
+# cannot re-escape the backslashes introduced by the other rules.
+TEX_TRANS = str.maketrans({
+    '\\': r'\textbackslash{}',
     '&': r'\&',
     '%': r'\%',
     '$': r'\$',
@@ -197,10 +255,15 @@ def tex_safe(text: str) -> str:
     '}': r'\}',
     '~': r'\textasciitilde{}',
     '^': r'\textasciicircum{}',
-    }
-    # We use a regex to replace these characters
-    return "".join(chars.get(c, c) for c in text)
+})
 
+# Sanitizers are pure; courses repeat the same strings (shared outcome
+# templates, recurring topics), so results are memoized.
+@lru_cache(maxsize=8192)
+def tex_safe(text: str) -> str:
+    return text.translate(TEX_TRANS)
+
+@lru_cache(maxsize=8192)
 def robust_tex_sanitize(line: str) -> str:
     #   Partitions a line into math and non-math segments to 
     # sanitize reserved characters outside of math mode.
@@ -318,9 +381,13 @@ def read_programme_details(path: Path, file: str):
     return programme
 
 
-def extract_course_header(md_tokens, file) -> tuple[str, str, str, str | None]:
+def extract_course_header(md_tokens, file) -> tuple[str, str, str, str | None, int]:
+    # Also returns the index of the first heading after the course title
+    # (any level, e.g. an H3 before the first H2) so build_course can
+    # resume the same token stream there instead of rescanning the header.
     title = None
     metadata_blob = []
+    body_idx = None
 
     i = 0
     while i < len(md_tokens):
@@ -329,6 +396,10 @@ def extract_course_header(md_tokens, file) -> tuple[str, str, str, str | None]:
         # Stop early once header section ends (H2 starts)
         if t.type == "heading_open" and t.tag == "h2":
             break
+
+        # Any other heading belongs to the body; the title H1 does not
+        if t.type == "heading_open" and body_idx is None and not (t.tag == "h1" and title is None):
+            body_idx = i
             
         # Course title (H1) - Standardized Detection
         if t.type == "heading_open" and t.tag == "h1":
@@ -370,19 +441,14 @@ def extract_course_header(md_tokens, file) -> tuple[str, str, str, str | None]:
     )
     prerequisite = prereq_match.group(1).strip() if prereq_match else None
 
-    ltpxc_match = re.search(
-        r"L\s*-\s*T\s*-\s*P\s*-\s*X\s*-\s*C\s*:\s*"
-        r"(\d+\s*-\s*\d+\s*-\s*\d+\s*-\s*\d+\s*-\s*\d+(?:\.\d+)?)",
-        full_text,
-        re.IGNORECASE
-    )
+    ltpxc_match = LTPXC_RE.search(full_text)
     if ltpxc_match is None:
         error("Missing L-T-P-X-C information", file)
 
     # Normalize LTPXC (remove spaces)
     ltpxc = re.sub(r"\s*", "", ltpxc_match.group(1))
 
-    return title, code, ltpxc, prerequisite
+    return title, code, ltpxc, prerequisite, i if body_idx is None else body_idx
 
 # -------------------------
 # Semantic Model Builders
@@ -392,7 +458,7 @@ def extract_course_header(md_tokens, file) -> tuple[str, str, str, str | None]:
 # Theory, Lab, X, Outcomes, and Articulation are semantically different
 # DSL constructs. Structural uniformity would reduce clarity.
 
-def build_course(md_tokens, file, title, code, ltpxc, prerequisite, programme_details):
+def build_course(md_tokens, file, title, code, ltpxc, prerequisite, programme_details, start_idx=0):
     course = {
         "title": title,
         "code": code,
@@ -404,16 +470,20 @@ def build_course(md_tokens, file, title, code, ltpxc, prerequisite, programme_de
     }
     course["articulation"] = {}
 
-    i = 0
+    # Articulation matrices need the final CO count, so their headings are
+    # queued during the single token pass and parsed once outcomes are known.
+    pending_articulation = []
+    next_heading_close = build_heading_close_index(md_tokens)
+
+    i = start_idx
     while i < len(md_tokens):
         t = md_tokens[i]
         
         if t.type == "heading_open":
-            # Use the helper to get the title regardless of token padding
-            section_title, title_idx = get_next_inline_content(md_tokens, i + 1)
-            if section_title is None:
-                i += 1
-                continue
+            # markdown-it always emits heading_open, inline, heading_close,
+            # so the title is the next token; no helper call on this path
+            title_idx = i + 1
+            section_title = md_tokens[title_idx].content.strip()
             
             if section_title == "Course Objectives":
                 i = parse_simple_list(md_tokens, title_idx + 1, course["objectives"], file)
@@ -424,10 +494,16 @@ def build_course(md_tokens, file, title, code, ltpxc, prerequisite, programme_de
                 continue
 
             if section_title.startswith("Unit"):
-                unit_data, next_idx = parse_unit(md_tokens, i, file)
+                unit_data, next_idx = parse_unit(md_tokens, i, file, next_heading_close)
                 course["units"].append(unit_data)
                 i = next_idx    # jump to inline content
                 continue        # skip linear increment
+
+            articulation_title = section_title.replace("–", "-")
+            if articulation_title.startswith("CO-"):
+                pending_articulation.append((title_idx, articulation_title))
+                i = title_idx + 1
+                continue
         i += 1
 
     if not course["title"] or not course["code"]:
@@ -435,51 +511,32 @@ def build_course(md_tokens, file, title, code, ltpxc, prerequisite, programme_de
     
     if not course["outcomes"]:
         error("Course Outcomes must be defined before articulation matrices", file)
-    expected_cos = [f"CO{i+1}" for i in range(len(course["outcomes"]))]
-    i = 0
-    while i < len(md_tokens):
-        t = md_tokens[i]
-        if t.type == "heading_open":
-            # Standardized detection for articulation headers
-            section_title, title_idx = get_next_inline_content(md_tokens, i + 1)
-            
-            if not section_title:
-                i += 1
-                continue
+    expected_cos = outcome_labels(CO_LABELS, "CO", len(course["outcomes"]))
+    expected_cos_set = frozenset(expected_cos)
+
+    # Column labels depend only on programme details; build them once
+    articulation_cols = {
+        "NBA_PO": outcome_labels(PO_LABELS, "PO", len(programme_details["NBA_PO"])),
+        "PSO": outcome_labels(PSO_LABELS, "PSO", len(programme_details["PSO"])),
+        "ABET_SO": outcome_labels(SO_LABELS, "SO", len(programme_details["ABET_SO"])),
+    }
 
-            section_title = section_title.replace("–", "-")
-            
-            if section_title.startswith("CO-"):
-                if not course["outcomes"]:
-                    error(f"Articulation matrix '{section_title}' appears before Course Outcomes", file)
-
-                # Determine which mapping to parse
-                if section_title == "CO-NBA Programme Outcomes Mapping":
-                    expected_cols = [f"PO{j+1}" for j in range(len(programme_details["NBA_PO"]))]
-                    #mapping, next_idx = parse_articulation_table(md_tokens, title_idx + 1, expected_cols, expected_cos, file, section_title)
-                    mapping, next_idx = parse_articulation_list(md_tokens, title_idx + 1, expected_cols, expected_cos, file, section_title)
-                    course["articulation"]["NBA_PO"] = mapping
-                    i = next_idx  # jump to inline content
-                    continue      # skip linear increment
-
-
-                if section_title == "CO-Programme Specific Outcomes Mapping":
-                    expected_cols = [f"PSO{j+1}" for j in range(len(programme_details["PSO"]))]
-                    #mapping, next_idx = parse_articulation_table(md_tokens, title_idx + 1, expected_cols, expected_cos, file, section_title)
-                    mapping, next_idx = parse_articulation_list(md_tokens, title_idx + 1, expected_cols, expected_cos, file, section_title)
-                    course["articulation"]["PSO"] = mapping
-                    i = next_idx  # jump to inline content
-                    continue      # skip linear increment
-
-
-                if section_title == "CO-ABET Student Outcomes Mapping":
-                    expected_cols = [f"SO{j+1}" for j in range(len(programme_details["ABET_SO"]))]
-                    #mapping, next_idx = parse_articulation_table(md_tokens, title_idx + 1, expected_cols, expected_cos, file,section_title)
-                    mapping, next_idx = parse_articulation_list(md_tokens, title_idx + 1, expected_cols, expected_cos, file, section_title)
-                    course["articulation"]["ABET_SO"] = mapping
-                    i = next_idx  # jump to inline content
-                    continue      # skip linear increment
-        i += 1
+    for title_idx, section_title in pending_articulation:
+        # Determine which mapping to parse
+        if section_title == "CO-NBA Programme Outcomes Mapping":
+            key = "NBA_PO"
+        elif section_title == "CO-Programme Specific Outcomes Mapping":
+            key = "PSO"
+        elif section_title == "CO-ABET Student Outcomes Mapping":
+            key = "ABET_SO"
+        else:
+            continue
+
+        mapping, _ = parse_articulation_list(
+            md_tokens, title_idx + 1, articulation_cols[key],
+            expected_cos, expected_cos_set, file, section_title
+        )
+        course["articulation"][key] = mapping
 
     # -------------------------
     # Presence validation
@@ -705,11 +762,14 @@ def parse_outcomes(tokens, start, target, file):
     return i
 
 # Pointer policy: state-machine parser.
-def parse_articulation_list(tokens, start_idx, expected_columns, expected_cos, file, title):
+def parse_articulation_list(tokens, start_idx, expected_columns, expected_cos, expected_cos_set, file, title):
     # Parses mapping data from a Markdown list format.
     # Format: - CO1: PO1=3, PO2=2, PSO1=1
     
-    mapping = {}
+    n_cols = len(expected_columns)
+    col_index = {col: j for j, col in enumerate(expected_columns)}
+    # Dense int8 matrix; -1 marks an unmapped ('-') cell
+    matrix = [array("b", [-1]) * n_cols for _ in expected_cos]
     seen_cos = set()
     i = start_idx
 
@@ -731,7 +791,7 @@ def parse_articulation_list(tokens, start_idx, expected_columns, expected_cos, f
                 error(f"Invalid list item in {title}: '{content}'. Must start with 'COn:'", file)
             
             co_label = co_match.group(1)
-            if co_label not in expected_cos:
+            if co_label not in expected_cos_set:
                 error(f"Unexpected {co_label} in {title}", file)
             
             # Extract all pairs like PO1=3 or PSO2=1
@@ -739,29 +799,31 @@ def parse_articulation_list(tokens, start_idx, expected_columns, expected_cos, f
             #pairs = re.findall(r'(\w+)\s*=\s*([123\-])', content)
             pairs = re.findall(r'(\w+)\s*=\s*([^,\s]+)', content)
             
-            row_mapping = {}
-            
+            # Missing columns stay -1 (treated as '-' in DSL)
+            row = array("b", [-1]) * n_cols
+
             # Validate columns and normalize values
             for col_name, val in pairs:
-                if col_name not in expected_columns:
+                col = col_index.get(col_name)
+                if col is None:
                     error(f"Invalid column '{col_name}' in {title} for {co_label}", file)
-                row_mapping[col_name] = normalize_value(val, file)
-            
-            # Fill in missing columns with None (treated as '-' in DSL)
-            for col in expected_columns:
-                if col not in row_mapping:
-                    row_mapping[col] = None
+                value = normalize_value(val, file)
+                row[col] = -1 if value is None else value
 
-            mapping[co_label] = row_mapping
+            # CO label is already validated against expected_cos (CO1..COn)
+            matrix[int(co_label[2:]) - 1] = row
             seen_cos.add(co_label)
         
         i += 1
 
     # 3. Validation: Ensure all COs are mapped
-    if set(expected_cos) != seen_cos:
-        error(f"Missing CO rows in {title}. Expected: {expected_cos}", file)
+    # Every entry in seen_cos is already checked against expected_cos_set,
+    # so a count comparison is sufficient here.
+    if len(seen_cos) != len(expected_cos):
+        missing = [co for co in expected_cos if co not in seen_cos]
+        error(f"Missing CO rows in {title}: {missing}. Expected: {list(expected_cos)}", file)
 
-    return mapping, i
+    return matrix, i
 
 
 # STRUCTURAL GRAMMAR — DO NOT RELAX
@@ -771,7 +833,7 @@ def parse_articulation_list(tokens, start_idx, expected_columns, expected_cos, f
 # Pointer policy: this function uses STRUCTURAL parsing.
 # Multiple nested loops advance `i`; do not add implicit `i += 1`.
 
-def parse_unit(tokens, idx, file):
+def parse_unit(tokens, idx, file, next_heading_close):
 
     # -------------------------
     # Parse Unit H2 heading
@@ -799,12 +861,10 @@ def parse_unit(tokens, idx, file):
         "lab": None,
         "x": None
     }
-    i=idx
     seen_sections = []
-    while i < len(tokens) and tokens[i].type != "heading_close":
-        i += 1
-        if i >= len(tokens):
-            error(f"Unit {unit['number']}: Heading '{header}' is unterminated (missing closing # tags or newline)", file)
+    i = next_heading_close[idx]
+    if i >= len(tokens):
+        error(f"Unit {unit['number']}: Heading '{header}' is unterminated (missing closing # tags or newline)", file)
 
     i += 1  # move past heading_close
     # Only H3 headings allowed inside a Unit at first
@@ -837,10 +897,7 @@ def parse_unit(tokens, idx, file):
         m_x = X_HDR_RE.match(section_title)
         
         # Move i to the end of the heading to begin parsing content
-        i = title_idx
-        while i < len(tokens) and tokens[i].type != "heading_close":
-            i += 1
-        i += 1 # move past heading_close
+        i = next_heading_close[title_idx] + 1 # move past heading_close
 
         # -------------------------
         # Theory Content section
@@ -973,46 +1030,40 @@ def parse_unit(tokens, idx, file):
 
                 # Robustly find experiment title (H4)
                 if tokens[i].type == "heading_open" and tokens[i].tag == "h4":
-                    exp_title, title_idx = get_next_inline_content(tokens, i + 1)
+                    title_idx = i + 1
+                    exp_title = tokens[title_idx].content.strip()
                     if not exp_title:
                         error(f"Unit {unit['number']}: Malformed H4 experiment heading", file)
                     
-                    # Move past H4 heading
-                    # BEGIN: consume heading block
-                    i = title_idx
-                    while i < len(tokens) and tokens[i].type != "heading_close":
-                        i += 1
-                    i += 1  # past heading_close
-                    # END: consume heading block
+                    # Move past H4 heading: markdown-it emits heading_open,
+                    # inline, heading_close for every heading level
+                    if title_idx + 1 >= len(tokens) or tokens[title_idx + 1].type != "heading_close":
+                        error(f"Unit {unit['number']}: Malformed H4 experiment heading '{exp_title}'", file)
+                    i = title_idx + 2  # past heading_close
 
                     # -------------------------
                     # Collect experiment description
                     # -------------------------
+                    # Single forward scan; list_depth tracks whether the
+                    # current inline sits inside a bullet (gets a "- " prefix)
                     description = []
+                    list_depth = 0
                     while i < len(tokens):
+                        t = tokens[i]
                         # Stop if any new heading starts
-                        if tokens[i].type == "heading_open":
+                        if t.type == "heading_open":
                             break
-                        
-                        # Use the helper to seek the next piece of actual text
-                        content, next_idx = get_next_inline_content(tokens, i)
-                        
-                        if content:
-                            # Detect if this content is inside a bullet list to add a prefix
-                            is_list_item = False
-                            # Look back slightly to see if we are inside a list item
-                            check_idx = i
-                            while check_idx < next_idx:
-                                if tokens[check_idx].type == "list_item_open":
-                                    is_list_item = True
-                                    break
-                                check_idx += 1
-                            
-                            prefix = "- " if is_list_item else ""
-                            description.append(f"{prefix}{content}")
-                            i = next_idx # Advance past the found content
-                        else:
-                            i += 1
+
+                        if t.type == "list_item_open":
+                            list_depth += 1
+                        elif t.type == "list_item_close":
+                            list_depth -= 1
+                        elif t.type == "inline":
+                            content = t.content.strip()
+                            if content:
+                                prefix = "- " if list_depth else ""
+                                description.append(f"{prefix}{content}")
+                        i += 1
 
                     if not description:
                         error(f"Unit {unit['number']}: Experiment '{exp_title}' has no description", file)
@@ -1077,37 +1128,33 @@ def parse_unit(tokens, idx, file):
                     continue
 
                 if tokens[i].type == "heading_open" and tokens[i].tag == "h4":
-                    comp_title, title_idx = get_next_inline_content(tokens, i + 1)
+                    title_idx = i + 1
+                    comp_title = tokens[title_idx].content.strip()
                     if not comp_title:
                         error(f"Unit {unit['number']}: Malformed H4 component heading", file)
-                    # BEGIN: consume heading block
-                    i = title_idx
-                    while i < len(tokens) and tokens[i].type != "heading_close":
-                        i += 1
-                    i += 1  # past heading_close
-                    # END: consume heading block
+                    # Move past H4 heading: markdown-it emits heading_open,
+                    # inline, heading_close for every heading level
+                    if title_idx + 1 >= len(tokens) or tokens[title_idx + 1].type != "heading_close":
+                        error(f"Unit {unit['number']}: Malformed H4 component heading '{comp_title}'", file)
+                    i = title_idx + 2  # past heading_close
 
                     description = []
+                    list_depth = 0
                     while i < len(tokens):
-                        if tokens[i].type == "heading_open":
+                        t = tokens[i]
+                        if t.type == "heading_open":
                             break
-                        
-                        content, next_idx = get_next_inline_content(tokens, i)
-                        
-                        if content:
-                            is_list_item = False
-                            check_idx = i
-                            while check_idx < next_idx:
-                                if tokens[check_idx].type == "list_item_open":
-                                    is_list_item = True
-                                    break
-                                check_idx += 1
-                            
-                            prefix = "- " if is_list_item else ""
-                            description.append(f"{prefix}{content}")
-                            i = next_idx 
-                        else:
-                            i += 1
+
+                        if t.type == "list_item_open":
+                            list_depth += 1
+                        elif t.type == "list_item_close":
+                            list_depth -= 1
+                        elif t.type == "inline":
+                            content = t.content.strip()
+                            if content:
+                                prefix = "- " if list_depth else ""
+                                description.append(f"{prefix}{content}")
+                        i += 1
 
                     if not description:
                         error(f"Unit {unit['number']}: X-Activity component '{comp_title}' has no description", file)
@@ -1153,51 +1200,50 @@ def parse_unit(tokens, idx, file):
 # -------------------------
 # LaTeX Emission (Semantic Only)
 # -------------------------
-def emit_articulation_block(title, columns, mapping):
-    out = []
-    out.append(f"\\BeginArticulation{{{title}}}{{{len(columns)}}}")
+def emit_articulation_block(title, columns, matrix):
+    # Yields newline-terminated lines for the caller to write
+    yield f"\\BeginArticulation{{{title}}}{{{len(columns)}}}\n"
 
     header = "CO & " + " & ".join(columns)
-    out.append(f"\\ArticulationHeader{{{header}}}")
-
-    for co in sorted(mapping.keys(), key=lambda x: int(x[2:])):
-        row = mapping[co]
-        values = []
-        for col in columns:
-            v = row[col]
-            values.append("-" if v is None else str(v))
-        out.append(
-            "\\ArticulationRow{" +
-            f"{co} & " + " & ".join(values) +
-            "}"
-        )
+    yield f"\\ArticulationHeader{{{header}}}\n"
+
+    # Row layout depends only on the column count; build it once per block
+    row_tmpl = "\\ArticulationRow{{{} & " + " & ".join(["{}"] * len(columns)) + "}}\n"
+
+    # Rows are stored in CO order, so labels pair up positionally;
+    # no per-row key parsing or sorting is needed
+    co_labels = outcome_labels(CO_LABELS, "CO", len(matrix))
+    for co, row in zip(co_labels, matrix):
+        yield row_tmpl.format(co, *["-" if v < 0 else str(v) for v in row.tolist()])
 
-    out.append("\\EndArticulation")
-    return out
+    yield "\\EndArticulation\n"
+
+def emit_latex(courses, programme_details, fh):
+    # Streams the LaTeX body straight into the open output file
+
+    # Articulation columns depend only on programme details
+    po_cols = outcome_labels(PO_LABELS, "PO", len(programme_details["NBA_PO"]))
+    pso_cols = outcome_labels(PSO_LABELS, "PSO", len(programme_details["PSO"]))
+    so_cols = outcome_labels(SO_LABELS, "SO", len(programme_details["ABET_SO"]))
 
-def emit_latex(courses, programme_details):
-    out = []
     for c in courses:
         
-        out.append(f"\\BeginCourse{{{c['code']}}}{{{c['title']}}}{{{c['ltpxc']}}}{{{c['prerequisite'] if c['prerequisite'] else 'None'  }}}")
+        fh.write(f"\\BeginCourse{{{c['code']}}}{{{c['title']}}}{{{c['ltpxc']}}}{{{c['prerequisite'] if c['prerequisite'] else 'None'  }}}\n")
 
-        out.append("\\CourseObjectives{")
+        fh.write("\\CourseObjectives{\n")
         for o in c["objectives"]:
-            out.append(f"  \\COBItem{{{tex_safe(o)}}}")
-        out.append("}")
+            fh.write(f"  \\COBItem{{{tex_safe(o)}}}\n")
+        fh.write("}\n")
 
-        out.append("\\CourseOutcomes{")
+        fh.write("\\CourseOutcomes{\n")
         for o in c["outcomes"]:
-            out.append(f"  \\COItem{{{tex_safe(o)}}}")
-        out.append("}")
+            fh.write(f"  \\COItem{{{tex_safe(o)}}}\n")
+        fh.write("}\n")
         # -------------------------
         # Articulation Matrices
         # -------------------------
-        po_cols = [f"PO{i+1}" for i in range(len(programme_details["NBA_PO"]))]
-        pso_cols = [f"PSO{i+1}" for i in range(len(programme_details["PSO"]))]
-        so_cols = [f"SO{i+1}" for i in range(len(programme_details["ABET_SO"]))]
         if "NBA_PO" in c["articulation"]:            
-            out.extend(
+            fh.writelines(
                 emit_articulation_block(
                     "CO-NBA Programme Outcomes Mapping",
                     po_cols,
@@ -1206,7 +1252,7 @@ def emit_latex(courses, programme_details):
             )
 
         if "PSO" in c["articulation"]:
-            out.extend(
+            fh.writelines(
                 emit_articulation_block(
                     "CO-Programme Specific Outcomes Mapping",
                     pso_cols,
@@ -1215,7 +1261,7 @@ def emit_latex(courses, programme_details):
             )
 
         if "ABET_SO" in c["articulation"]:
-            out.extend(
+            fh.writelines(
                 emit_articulation_block(
                     "CO-ABET Student Outcomes Mapping",
                     so_cols,
@@ -1229,50 +1275,99 @@ def emit_latex(courses, programme_details):
         for u in c["units"]:
             # Sanitize unit title
             safe_title = tex_safe(u['title'])
-            out.append(f"\\BeginUnit{{{u['number']}}}{{{safe_title}}}")
+            fh.write(f"\\BeginUnit{{{u['number']}}}{{{safe_title}}}\n")
 
             # -------- Theory --------
             if u["theory"] is not None:
-                out.append(f"\\BeginTheory{{{u['theory']['hours']}}}")
+                fh.write(f"\\BeginTheory{{{u['theory']['hours']}}}\n")
                 for topic, subs in u["theory"]["topics"]:
                     # Sanitize topic and sub-details
                     safe_topic = tex_safe(topic)
                     safe_subs = [tex_safe(s) for s in subs]
                     joined = "; ".join(safe_subs)
-                    out.append(f"  \\TheoryTopic{{{safe_topic}}}{{{joined}}}")
-                out.append("\\EndTheory")
+                    fh.write(f"  \\TheoryTopic{{{safe_topic}}}{{{joined}}}\n")
+                fh.write("\\EndTheory\n")
 
             # -------- Laboratory --------
             if u["lab"] is not None:
-                out.append(f"\\BeginLab{{{u['lab']['hours']}}}")
+                fh.write(f"\\BeginLab{{{u['lab']['hours']}}}\n")
                 for exp in u["lab"]["experiments"]:
                     safe_exp_title = tex_safe(exp['title'])
-                    out.append(f"  \\LabExperiment{{{safe_exp_title}}}")
+                    fh.write(f"  \\LabExperiment{{{safe_exp_title}}}\n")
                     for line in exp["description"]:
                         # If the line contains '$', it's math; don't sanitize it
                         # Otherwise, make it safe
                         safe_line = robust_tex_sanitize(line)
-                        out.append(f"    \\LabDesc{{{safe_line}}}")
-                    out.append("  \\EndLabExperiment")
-                out.append("\\EndLab")
+                        fh.write(f"    \\LabDesc{{{safe_line}}}\n")
+                    fh.write("  \\EndLabExperiment\n")
+                fh.write("\\EndLab\n")
 
             # -------- X-Activity (Apply same logic) --------
             if u["x"] is not None:
-                out.append(f"\\BeginXActivity{{{u['x']['hours']}}}")
+                fh.write(f"\\BeginXActivity{{{u['x']['hours']}}}\n")
                 for comp in u["x"]["components"]:
                     safe_comp_title = tex_safe(comp['title'])
-                    out.append(f"  \\XComponent{{{safe_comp_title}}}")
+                    fh.write(f"  \\XComponent{{{safe_comp_title}}}\n")
                     for line in comp["description"]:
                         safe_line = robust_tex_sanitize(line)
-                        out.append(f"    \\XDesc{{{safe_line}}}")
-                    out.append("  \\EndXComponent")
-                out.append("\\EndXActivity")
+                        fh.write(f"    \\XDesc{{{safe_line}}}\n")
+                    fh.write("  \\EndXComponent\n")
+                fh.write("\\EndXActivity\n")
+
+            fh.write("\\EndUnit\n")
+
+        fh.write("\\EndCourse\n")
+
+
+
+# -------------------------
+# File loading
+# -------------------------
+
+async def load_all(paths):
+    # Reads all course files concurrently so disk latency overlaps.
+    # Failures are returned in place of the text, one slot per path,
+    # so a single unreadable file does not abort the batch.
+    return await asyncio.gather(
+        *(asyncio.to_thread(p.read_text, encoding="utf-8") for p in paths),
+        return_exceptions=True
+    )
 
-            out.append("\\EndUnit")
 
-        out.append("\\EndCourse")
+def _cache_salt(programme_details) -> bytes:
+    # Cached results are only valid for this parser, this markdown-it
+    # release (it shapes the token stream), this DSL policy and this
+    # programme definition; fold all four into every key.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(markdown_it.__version__.encode("utf-8"))
+    h.update(DSL_POLICY_VERSION.encode("utf-8"))
+    h.update(repr(programme_details).encode("utf-8"))
+    return h.digest()
 
-    return "\n".join(out)
+
+def _process_one(md_name, text, programme_details):
+    # Worker entry point: parse and build a single course file.
+    # Errors are returned as strings rather than raised, so nothing
+    # has to be pickled back across the process boundary as an exception.
+    try:
+        tokens = parse_markdown(text)
+
+        # Extract header and build course
+        # One token stream serves both stages; the body pass starts
+        # where the header pass stopped.
+        title, code, ltpxc, prereq, body_idx = extract_course_header(tokens, md_name)
+        course_data = build_course(
+            tokens, md_name, title, code, ltpxc, prereq, programme_details,
+            start_idx=body_idx
+        )
+        return course_data, None
+
+    except SyllabusError as e:
+        return None, str(e)
+    except Exception as e:
+        # Capture unexpected crashes so one file cannot stop the batch
+        return None, f"{md_name}: Unexpected error: {str(e)}"
 
 
 # -------------------------
@@ -1319,26 +1414,82 @@ def main():
         print(f"Error: Directory '{input_dir}' not found.")
         sys.exit(1)
 
-    for md_file in input_dir.glob("*.md"):
+    # Unchanged files are served from the content-hash cache
+    cache = TokenCache(CACHE_DIR, salt=_cache_salt(programme_details))
+    manifest = cache.read_manifest()
+    new_manifest = {}
+
+    # Same selection as glob("*.md") (dot-files included), but the
+    # DirEntry carries the stat
+    entries = [e for e in os.scandir(input_dir) if e.name.endswith(".md")]
+    names = [e.name for e in entries]
+    results = [None] * len(entries)
+    keys = [None] * len(entries)
+    sigs = [None] * len(entries)
+
+    # 1. Stat check: a matching (mtime_ns, size) reuses the cached result
+    #    without reading or hashing the file.
+    to_read = []
+    for n, entry in enumerate(entries):
         try:
-            text = md_file.read_text(encoding="utf-8")
-            tokens = parse_markdown(text)
-            
-            # Extract header and build course
-            title, code, ltpxc, prereq = extract_course_header(tokens, md_file.name)
-            course_data = build_course(
-                tokens, md_file.name, title, code, ltpxc, prereq, programme_details
-            )
-            
+            st = entry.stat()
+            sigs[n] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            to_read.append(n)
+            continue
+
+        rec = manifest.get(entry.name)
+        if rec is not None and rec["stat"] == sigs[n]:
+            results[n] = cache.get(rec["key"])
+            if results[n] is not None:
+                keys[n] = rec["key"]
+                continue
+        to_read.append(n)
+
+    # 2. Content check: read changed files and look up by content hash
+    #    (no event loop at all when every file was a stat hit)
+    texts = asyncio.run(load_all([Path(entries[n].path) for n in to_read])) if to_read else []
+
+    misses = []
+    for n, text in zip(to_read, texts):
+        if isinstance(text, BaseException):
+            results[n] = (None, f"{names[n]}: Unexpected error: {str(text)}")
+            continue
+        keys[n] = cache.key_for(names[n], text)
+        results[n] = cache.get(keys[n])
+        if results[n] is None:
+            misses.append((n, text))
+
+    # Each file is independent; parse larger batches of misses across
+    # processes. Results are slotted back by index, so emission stays
+    # deterministic either way.
+    if len(misses) >= MIN_PARALLEL_FILES:
+        worker = partial(_process_one, programme_details=programme_details)
+        with ProcessPoolExecutor() as ex:
+            computed = list(ex.map(
+                worker,
+                [names[n] for n, _ in misses],
+                [text for _, text in misses]
+            ))
+    else:
+        computed = [_process_one(names[n], text, programme_details) for n, text in misses]
+
+    for (n, _), result in zip(misses, computed):
+        results[n] = result
+        cache.put(keys[n], result)
+
+    for n, name in enumerate(names):
+        if keys[n] is not None and sigs[n] is not None:
+            new_manifest[name] = {"stat": sigs[n], "key": keys[n]}
+    cache.write_manifest(new_manifest)
+
+    for course_data, err in results:
+        if err is not None:
+            # Capture error and move to next file
+            all_errors.append(err)
+        else:
             # Only add to list if successful
             courses.append(course_data)
-            
-        except SyllabusError as e:
-            # Capture error and move to next file
-            all_errors.append(str(e))
-        except Exception as e:
-            # Capture unexpected crashes to prevent loop breakage
-            all_errors.append(f"{md_file.name}: Unexpected error: {str(e)}")
 
     # --- Final Report and Emission ---
     if all_errors:
@@ -1353,7 +1504,15 @@ def main():
         output.parent.mkdir(exist_ok=True)
         
         print(f"Generating LaTeX for {len(courses)} successful courses...")
-        output.write_text(emit_latex(courses, programme_details), encoding="utf-8")
+        # Stream into a temp file and swap it in, so a failure partway
+        # through never leaves a truncated body_md.tex behind
+        tmp = output.with_suffix(".tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fh:
+                emit_latex(courses, programme_details, fh)
+            os.replace(tmp, output)
+        finally:
+            tmp.unlink(missing_ok=True)
     else:
         print("No valid courses found to generate LaTeX.")
 
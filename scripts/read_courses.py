@@ -31,121 +31,158 @@ Later Stages (not implemented here):
 
 from pathlib import Path
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
+import asyncio
 import json
-from paths import get_path
+import mmap
+import os
+import re
+from paths import get_path, get_project_root
+from _md_cache import MIN_PARALLEL_FILES, TokenCache
 
 COURSES_DIRNAME = "courses_md"
 OUTPUTS_DIRNAME = "outputs"
 INDEX_FILENAME = "index.md"
 REPORT_FILENAME = "error_report.json"
 MASTER_TEX_FILENAME = "course_data.tex"
+SECTION_CACHE_DIRNAME = ".cache/sections"
 
-@dataclass
+@dataclass(slots=True)
 class MarkdownSection:
     level: int          # 0 for preamble, 1+ for headers
     title: str          # "__PREAMBLE__" or header text
     body: str           # raw content under this section
 
 
-def split_markdown_sections(md_text: str) -> list[MarkdownSection]:
-    sections: list[MarkdownSection] = []
+# Fence runs and ATX headings, matched at line starts in one C-level pass.
+# Leading whitespace mirrors str.lstrip(); everything else is normal content.
+_BLOCK_RE = re.compile(
+    r"^[^\S\n]*(?:(?P<fence>`{3,}|~{3,})|(?P<hashes>#+) (?P<title>[^\n]*))",
+    re.MULTILINE,
+)
+
+# Line boundaries recognised by str.splitlines() besides "\n"
+_EXTRA_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile(r"\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _scan_sections_py(md_text: str) -> list[tuple[int, str, str]]:
+    """
+    Pure-Python section scanner over "\n"-normalised text.
+
+    Returns raw (level, title, body) triples, PREAMBLE first.
+    _md_scan.scan_sections (Cython) is a drop-in replacement.
+    """
+    raw: list[tuple[int, str, str]] = []
 
     # Initialize PREAMBLE
     current_level: int = 0
     current_title: str = "__PREAMBLE__"
-    current_body: list[str] = []
+    body_start: int = 0
 
     in_code_block: bool = False
     code_fence: str | None = None   # exact fence string, e.g. ``` or ```` or ~~~
 
-    lines = md_text.splitlines()
-
-    for line in lines:
-        stripped = line.lstrip()
+    for m in _BLOCK_RE.finditer(md_text):
+        # Single dispatch on which alternative matched:
+        # "fence" for fence runs, "title" for ATX headings
+        kind = m.lastgroup
 
         # --------------------------------------------------
         # Detect start/end of fenced code blocks
+        # (fence lines stay part of the section body)
         # --------------------------------------------------
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            # capture full fence run (all same chars)
-            fence_char = stripped[0]
-            i = 0
-            while i < len(stripped) and stripped[i] == fence_char:
-                i += 1
-            fence = stripped[:i]
-
+        if kind == "fence":
+            fence = m.group("fence")
             if not in_code_block:
                 in_code_block = True
                 code_fence = fence
             elif fence == code_fence:
                 in_code_block = False
                 code_fence = None
-
-            current_body.append(line)
             continue
 
         # --------------------------------------------------
         # Header detection (ONLY if not inside code block)
         # --------------------------------------------------
-        if not in_code_block and stripped.startswith("#"):
-            i = 0
-            while i < len(stripped) and stripped[i] == "#":
-                i += 1
-
-            # Valid Markdown header rules:
-            # 1. One or more '#'
-            # 2. Followed by a space
-            # 3. Non-empty title text
-            if (
-                i > 0
-                and i < len(stripped)
-                and stripped[i] == " "
-                and stripped[i + 1 :].strip() != ""
-            ):
-                # Flush current section
-                sections.append(
-                    MarkdownSection(
-                        level=current_level,
-                        title=current_title,
-                        body="\n".join(current_body).strip()
-                    )
-                )
+        # Valid Markdown header rules:
+        # 1. One or more '#'
+        # 2. Followed by a space
+        # 3. Non-empty title text
+        title = m.group("title").strip()
+        if in_code_block or not title:
+            continue
 
-                # Start new section
-                current_level = i
-                current_title = stripped[i + 1 :].strip()
-                current_body = []
-                continue
+        # Flush current section
+        raw.append((current_level, current_title, md_text[body_start:m.start()].strip()))
 
-        # --------------------------------------------------
-        # Normal content
-        # --------------------------------------------------
-        current_body.append(line)
+        # Start new section
+        current_level = len(m.group("hashes"))
+        current_title = title
+        body_start = m.end()
 
     # Flush final section
-    sections.append(
-        MarkdownSection(
-            level=current_level,
-            title=current_title,
-            body="\n".join(current_body).strip()
-        )
-    )
+    raw.append((current_level, current_title, md_text[body_start:].strip()))
+
+    return raw
+
+
+# Prefer the compiled scanner when it has been built
+# (cythonize -i scripts/_md_scan.pyx); fall back to pure Python.
+try:
+    from _md_scan import scan_sections as _scan_sections
+except ImportError:
+    _scan_sections = _scan_sections_py
+
+
+def _section_cache_salt() -> bytes:
+    """
+    Salt for the section cache: this module's source plus, when the
+    compiled scanner is in use, its path and mtime so a rebuild of
+    _md_scan invalidates previously cached sections.
+    """
+    salt = Path(__file__).read_bytes()
+    if _scan_sections is not _scan_sections_py:
+        import _md_scan
+        st = os.stat(_md_scan.__file__)
+        salt += f"\0{_md_scan.__file__}\0{st.st_mtime_ns}".encode()
+    return salt
+
+
+def _split_raw_sections(md_text: str) -> list[tuple[int, str, str]]:
+    """
+    Split into plain (level, title, body) triples.
+
+    This is the form that crosses process and cache boundaries: tuples
+    of builtins unpickle anywhere, whereas MarkdownSection would be
+    pickled as __main__.MarkdownSection when this file runs as a script.
+    """
+    # Normalise line endings so "^" agrees with splitlines() semantics
+    # (substring checks are far cheaper than an always-on sub)
+    if any(c in md_text for c in _EXTRA_LINE_BREAKS):
+        md_text = _LINE_BREAK_RE.sub("\n", md_text)
+
+    raw = _scan_sections(md_text)
 
     # --------------------------------------------------
     # Filter out empty PREAMBLE if it has no body
     # --------------------------------------------------
-    if (
-        sections
-        and sections[0].title == "__PREAMBLE__"
-        and sections[0].body == ""
-    ):
-        sections = sections[1:]
+    if raw and raw[0][1] == "__PREAMBLE__" and raw[0][2] == "":
+        raw = raw[1:]
 
-    return sections
+    return raw
 
 
-@dataclass
+def _build_sections(raw: list[tuple[int, str, str]]) -> list[MarkdownSection]:
+    return [MarkdownSection(level=level, title=title, body=body) for level, title, body in raw]
+
+
+def split_markdown_sections(md_text: str) -> list[MarkdownSection]:
+    return _build_sections(_split_raw_sections(md_text))
+
+
+@dataclass(slots=True)
 class CourseError:
     course_code: str
     stage: str
@@ -180,19 +217,56 @@ def read_course_index(index_path: Path) -> List[str]:
     return course_codes
 
 
-def load_courses() -> Tuple[Dict[str, str], List[CourseError], int]:
+def _read_course_file(
+    course_file: Path,
+    cache: TokenCache,
+) -> Tuple[str, List[MarkdownSection] | None, str | None]:
+    """
+    Hash a course file's raw bytes and consult the section cache.
+
+    Returns (key, sections, None) on a cache hit and (key, None, text)
+    on a miss; the UTF-8 decode only happens on a miss.
+    """
+    fd = os.open(course_file, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        # mmap cannot map an empty file
+        buf = mmap.mmap(fd, 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            key = cache.key_for(buf)
+            raw = cache.get(key)
+            if raw is not None:
+                return key, _build_sections(raw), None
+            return key, None, str(buf, "utf-8")
+        finally:
+            if size:
+                buf.close()
+    finally:
+        os.close(fd)
+
+
+def load_courses() -> Tuple[Dict[str, List[MarkdownSection]], List[CourseError], int]:
     courses_dir = get_path(COURSES_DIRNAME)
     index_path = courses_dir / INDEX_FILENAME
 
     course_codes = read_course_index(index_path)
 
-    loaded: Dict[str, str] = {}
+    # Sections depend only on file bytes and the splitter in use.
+    # TokenCache creates the directory itself and degrades to a no-op
+    # cache if it cannot.
+    cache = TokenCache(
+        get_project_root() / SECTION_CACHE_DIRNAME,
+        salt=_section_cache_salt(),
+    )
+
+    loaded: Dict[str, List[MarkdownSection] | None] = {}
     errors: List[CourseError] = []
+    misses: List[Tuple[str, str, str]] = []   # (code, key, text)
 
     for code in course_codes:
         course_file = courses_dir / f"{code}.md"
         try:
-            loaded[code] = course_file.read_text(encoding="utf-8")
+            key, sections, text = _read_course_file(course_file, cache)
         except Exception as e:
             errors.append(
                 CourseError(
@@ -201,6 +275,28 @@ def load_courses() -> Tuple[Dict[str, str], List[CourseError], int]:
                     message=str(e),
                 )
             )
+            continue
+
+        # Slot reserved now so index order is preserved
+        loaded[code] = sections
+        if sections is None:
+            misses.append((code, key, text))
+
+    # Split larger batches of cache misses in parallel (CPU-bound,
+    # order-preserving)
+    if len(misses) >= MIN_PARALLEL_FILES:
+        with ProcessPoolExecutor() as ex:
+            split = list(ex.map(
+                _split_raw_sections,
+                [text for _, _, text in misses],
+                chunksize=8,
+            ))
+    else:
+        split = [_split_raw_sections(text) for _, _, text in misses]
+
+    for (code, key, _), raw in zip(misses, split):
+        loaded[code] = _build_sections(raw)
+        cache.put(key, raw)
 
     return loaded, errors, len(course_codes)
 
@@ -238,7 +334,7 @@ def write_report(
 
 def write_master_course_tex(
     output_dir: Path,
-    courses: Dict[str, str],
+    courses: Dict[str, List[MarkdownSection]],
 ) -> Path:
     """
     Write a single master TeX file containing all courses
@@ -247,7 +343,9 @@ def write_master_course_tex(
     output_dir.mkdir(parents=True, exist_ok=True)
     tex_path = output_dir / MASTER_TEX_FILENAME
 
-    with tex_path.open("w", encoding="utf-8") as f:
+    # Single-threaded, ordered write; sections were split at load time.
+    # Large buffer: course fragments are written in few, big chunks
+    with tex_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
         f.write("% ==================================================\n")
         f.write("% AUTO-GENERATED FILE — DO NOT EDIT\n")
         f.write("% Course + Section data (Stage-1)\n")
@@ -260,19 +358,19 @@ def write_master_course_tex(
         # --------------------------------------------------
         # Per-course data
         # --------------------------------------------------
-        for c_idx, (code, md_text) in enumerate(courses.items(), start=1):
-            sections = split_markdown_sections(md_text)
-
-            f.write(f"% ---------- COURSE {c_idx} ----------\n")
+        for c_idx, (code, sections) in enumerate(courses.items(), start=1):
+            # Accumulate the whole course fragment; one write per course
+            buf: list[str] = []
+            buf.append(f"% ---------- COURSE {c_idx} ----------\n")
 
             # Course-level metadata
-            f.write(
+            buf.append(
                 f"\\expandafter\\def\\csname CourseCode@{c_idx}\\endcsname"
                 f"{{{tex_detokenize(code)}}}\n"
             )
 
             # Section count for this course
-            f.write(
+            buf.append(
                 f"\\expandafter\\def\\csname CourseSecCount@{c_idx}\\endcsname"
                 f"{{{len(sections)}}}\n"
             )
@@ -281,23 +379,57 @@ def write_master_course_tex(
             # Per-section data
             # --------------------------------------------------
             for s_idx, sec in enumerate(sections, start=1):
-                f.write(
+                buf.append(
                     f"\\expandafter\\def\\csname CourseSecLevel@{c_idx}@{s_idx}\\endcsname"
                     f"{{{sec.level}}}\n"
                 )
-                f.write(
+                buf.append(
                     f"\\expandafter\\def\\csname CourseSecTitle@{c_idx}@{s_idx}\\endcsname"
                     f"{{{tex_detokenize(sec.title)}}}\n"
                 )
-                f.write(
+                buf.append(
                     f"\\expandafter\\def\\csname CourseSecBody@{c_idx}@{s_idx}\\endcsname"
                     f"{{{tex_detokenize(sec.body)}}}\n"
                 )
 
-            f.write("\n")
+            buf.append("\n")
+            f.write("".join(buf))
 
     return tex_path
 
+async def write_outputs(
+    output_dir: Path,
+    total_listed: int | None,
+    courses: Dict[str, List[MarkdownSection]],
+    errors: list[CourseError],
+    status: str,
+) -> Tuple[Path, Path | None]:
+    """
+    Write the report and, when courses loaded, the master TeX file.
+    The two files are independent, so their writes run concurrently
+    on worker threads.
+    """
+    report = asyncio.to_thread(
+        write_report,
+        output_dir=output_dir,
+        total_listed=total_listed,
+        loaded_count=len(courses),
+        errors=errors,
+        status=status,
+    )
+    if not courses:
+        return await report, None
+
+    report_path, tex_path = await asyncio.gather(
+        report,
+        asyncio.to_thread(
+            write_master_course_tex,
+            output_dir=output_dir,
+            courses=courses,
+        ),
+    )
+    return report_path, tex_path
+
 if __name__ == "__main__":
     outputs_dir = None
 
@@ -307,13 +439,13 @@ if __name__ == "__main__":
 
         status = "OK" if not errors else "PARTIAL"
 
-        report_path = write_report(
+        report_path, tex_path = asyncio.run(write_outputs(
             output_dir=outputs_dir,
             total_listed=total,
-            loaded_count=len(courses),
+            courses=courses,
             errors=errors,
             status=status,
-        )
+        ))
 
         print(f"Run completed with status: {status}")
         print(f"Report written to: {report_path}")
@@ -321,10 +453,6 @@ if __name__ == "__main__":
         if not courses:
             print("No valid courses loaded. Aborting.")
             raise SystemExit(1)
-        tex_path = write_master_course_tex(
-            output_dir=outputs_dir,
-            courses=courses,
-        )
         print(f"Master TeX data written to: {tex_path}")
 
     except Exception as fatal:
@@ -68,26 +68,28 @@ def validate_content_blocks(
 
 def validate_topic_grammar(course_code: str, units: List[UnitBlock]) -> None:
     for u in units:
-        for idx, topic in enumerate(u.topics, start=1):
-            if ":" not in topic:
-                raise ValidationError(
-                    course_code,
-                    f"{TG_PREFIX}-COLON-MISSING",
-                    f"Unit {u.number}: Topic {idx} must contain ':' separating title and sub-topics"
-                )
+        # First offending topic (1-based), or 0 when all are valid
+        bad = next((idx for idx, t in enumerate(u.topics, 1) if ":" not in t), 0)
+        if bad:
+            raise ValidationError(
+                course_code,
+                f"{TG_PREFIX}-COLON-MISSING",
+                f"Unit {u.number}: Topic {bad} must contain ':' separating title and sub-topics"
+            )
 
 def validate_experiment_blocks(course_code: str, units: List[UnitBlock]) -> None:
     for u in units:
-        for idx, exp in enumerate(u.experiments, start=1):
-            if not exp.strip():
-                raise ValidationError(
-                    course_code,
-                    f"{EXP_PREFIX}-TITLE-MISSING",
-                    f"Unit {u.number}: Experiment {idx} title missing"
-                )
+        # First blank experiment title (1-based), or 0 when all are present
+        bad = next((idx for idx, e in enumerate(u.experiments, 1) if not e.strip()), 0)
+        if bad:
+            raise ValidationError(
+                course_code,
+                f"{EXP_PREFIX}-TITLE-MISSING",
+                f"Unit {u.number}: Experiment {bad} title missing"
+            )
 
-            # Description presence check is deferred to section-level parsing
-            # Placeholder invariant for future extension
+        # Description presence check is deferred to section-level parsing
+        # Placeholder invariant for future extension
 def validate_x_activity_blocks(course_code: str, units: List[UnitBlock]) -> None:
     for u in units:
         if u.x_hours:
@@ -37,8 +37,10 @@ KARE B.Tech Regulations R2025
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import List, Optional, Tuple
 import re
 
@@ -54,7 +56,7 @@ class ContentShape(Enum):
     PROJECT = "project"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarkdownSection:
     title: str
     body: str
@@ -63,28 +65,42 @@ class MarkdownSection:
 class ValidationError(Exception):
     def __init__(self, course_code: str, invariant_id: str, message: str):
         super().__init__(f"{course_code} [{invariant_id}]: {message}")
+        self.course_code = course_code
+        self.invariant_id = invariant_id
+        self.message = message
+
+    def __reduce__(self):
+        # Rebuild from the original fields so errors survive the trip
+        # back from worker processes (see validate_courses)
+        return (type(self), (self.course_code, self.invariant_id, self.message))
 
 
 # ---------------------------
 # Regex + Normalization
 # ---------------------------
 
+# Unicode classes on purpose: authored lines may carry NBSP gaps or
+# full-width digits, which \s and \d (and int()) accept as-is.
 UNIT_HEADER_RE = re.compile(
-    r"""
-    \bunit
-    \s*[-:]?\s*
-    (?P<num>[1-9]\d*)
-    \s*[-:–]?\s*
-    (?P<title>.*)?
-    """,
-    re.IGNORECASE | re.VERBOSE,
+    r"\bunit\s*[-:]?\s*(?P<num>[1-9]\d*)\s*[-:–]?\s*(?P<title>.*)?",
+    re.I,
 )
 
 THEORY_HOURS_RE = re.compile(r"(theory\s*hours?|lecture\s*hours?)\s*[:\-]?\s*(\d+)", re.I)
 LAB_HOURS_RE    = re.compile(r"(lab\s*hours?|practical\s*hours?)\s*[:\-]?\s*(\d+)", re.I)
 X_HOURS_RE      = re.compile(r"(x\s*hours?|activity\s*hours?)\s*[:\-]?\s*(\d+)", re.I)
 
-TOTAL_HOURS_RE  = re.compile(r"(total\s*hours?)\s*[:\-]?\s*(\d+)", re.I)
+# "Total hours: N", searchable over a whole body: gaps are \s minus the
+# line breaks str.splitlines() knows, so a match never spans lines, as
+# with a per-line search
+_GAP = r"[^\S\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]*"
+TOTAL_LINE_RE   = re.compile(rf"(total{_GAP}hours?){_GAP}[:\-]?{_GAP}(\d+)", re.I)
+
+EXPERIMENT_RE   = re.compile(r"\b(experiment|lab)\b", re.I)
+
+PROJECT_TITLE_RE = re.compile(r"project", re.I)
+
+INTRO_RE = re.compile(r"^introduction\s+(?:to|of)\s+(.+)$", re.I)
 
 CAPSTONE_KEYWORDS = (
     "project",
@@ -95,12 +111,17 @@ CAPSTONE_KEYWORDS = (
 )
 
 
+# Pure function of `raw`; unit titles repeat across courses
+@lru_cache(maxsize=4096)
 def normalize_unit_title(raw: str) -> str:
     if not raw:
         return ""
+    # Each step below is a single C-level pass. Order matters: "&" must
+    # become "and" before title() ("A&B" -> "Aandb", not "A&B"), and
+    # title() capitalises after any uncased character, not only spaces.
     t = raw.strip()
     t = t.replace("&", "and")
-    t = re.sub(r"^introduction\s+(to|of)\s+(.+)$", r"Basics of \2", t, flags=re.I)
+    t = INTRO_RE.sub(r"Basics of \1", t)
     t = t.title()
     return t
 
@@ -109,7 +130,7 @@ def normalize_unit_title(raw: str) -> str:
 # Extractors
 # ---------------------------
 
-@dataclass
+@dataclass(slots=True)
 class UnitBlock:
     number: int
     title: str
@@ -121,7 +142,9 @@ class UnitBlock:
 
     @property
     def total_hours(self) -> int:
-        return int(self.theory_hours or 0) + int(self.lab_hours or 0) + int(self.x_hours or 0)
+        # Derived on access so blocks built or edited outside extract_units
+        # never report stale hours; hours are ints or None, no int() needed
+        return (self.theory_hours or 0) + (self.lab_hours or 0) + (self.x_hours or 0)
 
 
 def extract_units(sections: List[MarkdownSection]) -> List[UnitBlock]:
@@ -154,7 +177,9 @@ def extract_units(sections: List[MarkdownSection]) -> List[UnitBlock]:
             if not s:
                 continue
 
-            if s.startswith(("-", "*")):
+            # Most body lines are bullets; a one-character test settles
+            # them before any regex runs
+            if s[0] in "-*":
                 current.topics.append(s.lstrip("-* ").strip())
                 continue
 
@@ -173,7 +198,7 @@ def extract_units(sections: List[MarkdownSection]) -> List[UnitBlock]:
                 current.x_hours = int(mx.group(2))
                 continue
 
-            if re.search(r"\b(experiment|lab)\b", s, re.I):
+            if EXPERIMENT_RE.search(s):
                 current.experiments.append(s)
                 continue
 
@@ -184,17 +209,28 @@ def extract_units(sections: List[MarkdownSection]) -> List[UnitBlock]:
 
 
 def extract_project_block(sections: List[MarkdownSection]) -> List[MarkdownSection]:
-    return [s for s in sections if "project" in s.title.lower()]
+    # Case-insensitive search in place; no lowered copy per title
+    return [s for s in sections if PROJECT_TITLE_RE.search(s.title)]
 
 
 def extract_project_total_hours(project_section: MarkdownSection) -> Optional[int]:
-    for line in project_section.body.splitlines():
-        m = TOTAL_HOURS_RE.search(line.strip())
-        if m:
-            return int(m.group(2))
-    return None
+    # The first match in the body is the first match on the earliest line
+    m = TOTAL_LINE_RE.search(project_section.body)
+    return int(m.group(2)) if m else None
 
 def _check_unit_sequence(course_code: str, units: List[UnitBlock], invariant_prefix: str):
+    # Common case: strictly increasing numbers are unique and ordered,
+    # proven in one pass with no allocations
+    prev = 0
+    for u in units:
+        if u.number <= prev:
+            break
+        prev = u.number
+    else:
+        return
+
+    # Failure path: duplicates take priority over ordering wherever they
+    # occur, so classify over the whole list
     numbers = [u.number for u in units]
 
     if len(set(numbers)) != len(numbers):
@@ -212,157 +248,199 @@ def _check_unit_sequence(course_code: str, units: List[UnitBlock], invariant_pre
         )
 
 # ---------------------------
-# Validators
+# Unit rule sets
 # ---------------------------
+# The unit-based shapes share one validation pass; a RuleSet selects
+# which invariants apply. Checks always run in the order of
+# _validate_units, which is the order each shape has always reported.
+
+@dataclass(frozen=True, slots=True)
+class RuleSet:
+    prefix: str                                    # invariant id prefix
+    name: str                                      # shape name used in messages
+    unit_noun: str                                 # "units" | "modules" in messages
+    unit_count: Optional[int]                      # exact number of units
+    forbid_experiments: bool
+    experiment_range: Optional[Tuple[int, int]]    # also makes experiments mandatory
+    forbid_practice_hours: bool                    # lab/x hours
+    forbid_theory_hours: bool
+    topic_range: Optional[Tuple[int, int]]
+    topics_optional: bool                          # range applies only when topics exist
+    hour_block: str                                # "theory" | "any" | "practice"
+    zero_checks: Tuple[str, ...]                   # hour kinds that may not be zero
+    require_activity: bool
+    labelled: bool                                 # prefix unit messages with "Unit N (title)"
+
+
+ACADEMIC_THEORY_RULES = RuleSet(
+    prefix="AT",
+    name="Academic-Theory",
+    unit_noun="units",
+    unit_count=5,
+    forbid_experiments=True,
+    experiment_range=None,
+    forbid_practice_hours=True,
+    forbid_theory_hours=False,
+    topic_range=(4, 8),
+    topics_optional=False,
+    hour_block="theory",
+    zero_checks=("theory",),
+    require_activity=False,
+    labelled=True,
+)
 
-def validate_course(
-    course_code: str,
-    inferred_shape: ContentShape,
-    sections: List[MarkdownSection],
-    ltpxtotal_hours: int,
-) -> None:
-    if inferred_shape == ContentShape.ACADEMIC_THEORY:
-        validate_academic_theory(course_code, sections, ltpxtotal_hours)
-    elif inferred_shape == ContentShape.ACADEMIC_INTEGRATED:
-        validate_academic_integrated(course_code, sections, ltpxtotal_hours)
-    elif inferred_shape == ContentShape.SKILL_PRACTICE:
-        validate_skill_practice(course_code, sections, ltpxtotal_hours)
-    elif inferred_shape == ContentShape.PROJECT:
-        validate_project(course_code, sections, ltpxtotal_hours)
-    else:
-        raise ValidationError(course_code, "SHAPE-UNKNOWN", f"Unsupported content shape {inferred_shape}")
+ACADEMIC_INTEGRATED_RULES = RuleSet(
+    prefix="AI",
+    name="Academic-Integrated",
+    unit_noun="units",
+    unit_count=5,
+    forbid_experiments=False,
+    experiment_range=(1, 4),
+    forbid_practice_hours=False,
+    forbid_theory_hours=False,
+    topic_range=(4, 8),
+    topics_optional=True,
+    hour_block="any",
+    zero_checks=("theory", "lab", "x"),
+    require_activity=False,
+    labelled=True,
+)
 
+SKILL_PRACTICE_RULES = RuleSet(
+    prefix="SP",
+    name="Skill-Practice",
+    unit_noun="modules",
+    unit_count=None,
+    forbid_experiments=False,
+    experiment_range=None,
+    forbid_practice_hours=False,
+    forbid_theory_hours=True,
+    topic_range=None,
+    topics_optional=False,
+    hour_block="practice",
+    zero_checks=("lab", "x"),
+    require_activity=True,
+    labelled=False,
+)
+
+
+def _unit_label(u: UnitBlock) -> str:
+    # Only built on the (fail-fast, at most once) error path
+    return f"Unit {u.number}" + (f" ({u.title})" if u.title else "")
 
-def validate_academic_theory(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
-    units = extract_units(sections)
 
-    if len(units) != 5:
-        raise ValidationError(course_code, "AT-UNIT-COUNT", f"Expected exactly 5 units, found {len(units)}")
+def _validate_units(course_code: str, units: List[UnitBlock], rules: RuleSet, ltpxtotal_hours: int) -> None:
+    p = rules.prefix
 
-    _check_unit_sequence(course_code, units, "AT")
+    if rules.unit_count is not None and len(units) != rules.unit_count:
+        raise ValidationError(course_code, f"{p}-UNIT-COUNT", f"Expected exactly {rules.unit_count} units, found {len(units)}")
+
+    _check_unit_sequence(course_code, units, p)
 
     total_hours = 0
+    has_activity = False
 
-    for u in units:
-        unit_label = f"Unit {u.number}" + (f" ({u.title})" if u.title else "")
+    # Allowed topic counts as a bitset: bit n set <=> n topics is valid.
+    # Optional topics also allow zero. Counts past the top bit shift to 0.
+    topic_mask = 0
+    if rules.topic_range is not None:
+        lo, hi = rules.topic_range
+        topic_mask = ((1 << (hi + 1)) - 1) & ~((1 << lo) - 1)
+        if rules.topics_optional:
+            topic_mask |= 1
 
-        if u.experiments:
+    for u in units:
+        if rules.forbid_experiments and u.experiments:
             raise ValidationError(
                 course_code,
-                "AT-EXPERIMENT-FORBIDDEN",
-                f"{unit_label}: experiments are not allowed in Academic-Theory courses",
+                f"{p}-EXPERIMENT-FORBIDDEN",
+                f"{_unit_label(u)}: experiments are not allowed in {rules.name} courses",
             )
 
-        if u.lab_hours or u.x_hours:
+        if rules.experiment_range is not None:
+            lo, hi = rules.experiment_range
+            if not u.experiments:
+                raise ValidationError(course_code, f"{p}-EXPERIMENT-MISSING", f"{_unit_label(u)}: at least one experiment required")
+
+            if not (lo <= len(u.experiments) <= hi):
+                raise ValidationError(course_code, f"{p}-EXPERIMENT-COUNT", f"{_unit_label(u)}: experiments must be {lo}–{hi}")
+
+        if rules.forbid_practice_hours and (u.lab_hours or u.x_hours):
             raise ValidationError(
                 course_code,
-                "AT-NON-THEORY-HOURS-FORBIDDEN",
-                f"{unit_label}: lab/x hours are not allowed in Academic-Theory courses",
+                f"{p}-NON-THEORY-HOURS-FORBIDDEN",
+                f"{_unit_label(u)}: lab/x hours are not allowed in {rules.name} courses",
             )
 
-        if not (4 <= len(u.topics) <= 8):
+        if rules.forbid_theory_hours and u.theory_hours:
+            raise ValidationError(course_code, f"{p}-THEORY-FORBIDDEN", f"Theory hours not allowed in {rules.name} courses")
+
+        if rules.require_activity and (u.experiments or u.lab_hours or u.x_hours):
+            has_activity = True
+
+        if rules.topic_range is not None and not (topic_mask >> len(u.topics)) & 1:
+            lo, hi = rules.topic_range
+            if rules.topics_optional:
+                raise ValidationError(course_code, f"{p}-TOPIC-CARDINALITY", f"{_unit_label(u)}: topics must be {lo}–{hi} if present")
             raise ValidationError(
                 course_code,
-                "AT-TOPIC-CARDINALITY",
-                f"{unit_label}: topics must be between 4 and 8 (found {len(u.topics)})",
+                f"{p}-TOPIC-CARDINALITY",
+                f"{_unit_label(u)}: topics must be between {lo} and {hi} (found {len(u.topics)})",
             )
 
-        if u.theory_hours is None:
-            raise ValidationError(course_code, "AT-THEORY-HOUR-MISSING", f"{unit_label}: theory hours not declared")
-
-        if u.theory_hours == 0:
-            raise ValidationError(course_code, "AT-THEORY-HOUR-ZERO", f"{unit_label}: theory hours cannot be zero")
+        if rules.hour_block == "theory":
+            if u.theory_hours is None:
+                raise ValidationError(course_code, f"{p}-THEORY-HOUR-MISSING", f"{_unit_label(u)}: theory hours not declared")
+        elif rules.hour_block == "any":
+            if u.theory_hours is None and u.lab_hours is None and u.x_hours is None:
+                raise ValidationError(course_code, f"{p}-HOUR-BLOCK-MISSING", f"{_unit_label(u)}: no theory/lab/x hours declared")
+        elif rules.hour_block == "practice":
+            if u.lab_hours is None and u.x_hours is None:
+                raise ValidationError(course_code, f"{p}-PRACTICE-HOUR-MISSING", f"Practice hours (lab/x) must be declared for all {rules.unit_noun}")
+
+        for kind in rules.zero_checks:
+            if getattr(u, f"{kind}_hours") == 0:
+                message = f"{_unit_label(u)}: {kind} hours cannot be zero" if rules.labelled else f"{kind.capitalize()} hours cannot be zero"
+                raise ValidationError(course_code, f"{p}-{kind.upper()}-HOUR-ZERO", message)
 
         total_hours += u.total_hours
 
-    if total_hours != ltpxtotal_hours:
-        raise ValidationError(
-            course_code,
-            "AT-HOUR-MISMATCH",
-            f"Declared hours {total_hours} ≠ expected {ltpxtotal_hours}",
-        )
-
-
-def validate_academic_integrated(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
-    units = extract_units(sections)
-
-    if len(units) != 5:
-        raise ValidationError(course_code, "AI-UNIT-COUNT", f"Expected exactly 5 units, found {len(units)}")
-    
-    _check_unit_sequence(course_code, units, "AI")
-
-    total_hours = 0
-
-    for u in units:
-        unit_label = f"Unit {u.number}" + (f" ({u.title})" if u.title else "")
-
-        if not u.experiments:
-            raise ValidationError(course_code, "AI-EXPERIMENT-MISSING", f"{unit_label}: at least one experiment required")
-
-        if not (1 <= len(u.experiments) <= 4):
-            raise ValidationError(course_code, "AI-EXPERIMENT-COUNT", f"{unit_label}: experiments must be 1–4")
-
-        if u.topics and not (4 <= len(u.topics) <= 8):
-            raise ValidationError(course_code, "AI-TOPIC-CARDINALITY", f"{unit_label}: topics must be 4–8 if present")
-
-        if u.theory_hours is None and u.lab_hours is None and u.x_hours is None:
-            raise ValidationError(course_code, "AI-HOUR-BLOCK-MISSING", f"{unit_label}: no theory/lab/x hours declared")
-
-        if u.theory_hours == 0:
-            raise ValidationError(course_code, "AI-THEORY-HOUR-ZERO", f"{unit_label}: theory hours cannot be zero")
-
-        if u.lab_hours == 0:
-            raise ValidationError(course_code, "AI-LAB-HOUR-ZERO", f"{unit_label}: lab hours cannot be zero")
-
-        if u.x_hours == 0:
-            raise ValidationError(course_code, "AI-X-HOUR-ZERO", f"{unit_label}: x hours cannot be zero")
-
-        total_hours += u.total_hours
+    if rules.require_activity and not has_activity:
+        raise ValidationError(course_code, f"{p}-ACTIVITY-MISSING", "At least one activity/experiment (lab/x) is mandatory")
 
     if total_hours != ltpxtotal_hours:
         raise ValidationError(
             course_code,
-            "AI-HOUR-MISMATCH",
+            f"{p}-HOUR-MISMATCH",
             f"Declared hours {total_hours} ≠ expected {ltpxtotal_hours}",
         )
 
+# ---------------------------
+# Validators
+# ---------------------------
 
-def validate_skill_practice(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
-    units = extract_units(sections)
-
-    if units:
-        _check_unit_sequence(course_code, units, "SP")
-
-    total_hours = 0
-    has_activity = False
-
-    for u in units:
-        if u.theory_hours:
-            raise ValidationError(course_code, "SP-THEORY-FORBIDDEN", "Theory hours not allowed in Skill-Practice courses")
-
-        if u.experiments or u.lab_hours or u.x_hours:
-            has_activity = True
+def validate_course(
+    course_code: str,
+    inferred_shape: ContentShape,
+    sections: List[MarkdownSection],
+    ltpxtotal_hours: int,
+) -> None:
+    validator = _VALIDATORS.get(inferred_shape)
+    if validator is None:
+        raise ValidationError(course_code, "SHAPE-UNKNOWN", f"Unsupported content shape {inferred_shape}")
+    validator(course_code, sections, ltpxtotal_hours)
 
-        if u.lab_hours is None and u.x_hours is None:
-            raise ValidationError(course_code, "SP-PRACTICE-HOUR-MISSING", "Practice hours (lab/x) must be declared for all modules")
 
-        if u.lab_hours == 0:
-            raise ValidationError(course_code, "SP-LAB-HOUR-ZERO", "Lab hours cannot be zero")
+def validate_academic_theory(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
+    _validate_units(course_code, extract_units(sections), ACADEMIC_THEORY_RULES, ltpxtotal_hours)
 
-        if u.x_hours == 0:
-            raise ValidationError(course_code, "SP-X-HOUR-ZERO", "X hours cannot be zero")
 
-        total_hours += u.total_hours
+def validate_academic_integrated(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
+    _validate_units(course_code, extract_units(sections), ACADEMIC_INTEGRATED_RULES, ltpxtotal_hours)
 
-    if not has_activity:
-        raise ValidationError(course_code, "SP-ACTIVITY-MISSING", "At least one activity/experiment (lab/x) is mandatory")
 
-    if total_hours != ltpxtotal_hours:
-        raise ValidationError(
-            course_code,
-            "SP-HOUR-MISMATCH",
-            f"Declared hours {total_hours} ≠ expected {ltpxtotal_hours}",
-        )
+def validate_skill_practice(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
+    _validate_units(course_code, extract_units(sections), SKILL_PRACTICE_RULES, ltpxtotal_hours)
 
 
 def validate_project(course_code: str, sections: List[MarkdownSection], ltpxtotal_hours: int) -> None:
@@ -390,4 +468,37 @@ def validate_project(course_code: str, sections: List[MarkdownSection], ltpxtota
             course_code,
             "PR-HOUR-MISMATCH",
             f"Declared hours {hours} ≠ expected {ltpxtotal_hours}",
-        )
\ No newline at end of file
+        )
+
+# Shape -> validator; validators are exclusive, exactly one runs per course
+_VALIDATORS = {
+    ContentShape.ACADEMIC_THEORY: validate_academic_theory,
+    ContentShape.ACADEMIC_INTEGRATED: validate_academic_integrated,
+    ContentShape.SKILL_PRACTICE: validate_skill_practice,
+    ContentShape.PROJECT: validate_project,
+}
+
+
+# ---------------------------
+# Batch validation
+# ---------------------------
+
+def _validate_one(item: Tuple[str, ContentShape, List[MarkdownSection], int]) -> None:
+    validate_course(*item)
+
+
+def validate_courses(items: List[Tuple[str, ContentShape, List[MarkdownSection], int]]) -> None:
+    """
+    Validate a catalogue of (course_code, shape, sections, ltpxtotal_hours)
+    items across processes. Courses are independent; the first failing
+    course in input order raises its ValidationError and the courses not
+    yet started are cancelled.
+    """
+    with ProcessPoolExecutor() as ex:
+        try:
+            # Small tasks; batch several courses per round trip
+            for _ in ex.map(_validate_one, items, chunksize=8):
+                pass
+        except ValidationError:
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
@@ -0,0 +1,32 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from _md_cache import TokenCache  # noqa: E402
+
+
+def test_round_trip(tmp_path):
+    cache = TokenCache(tmp_path / "cache", salt=b"s")
+    key = cache.key_for("ECE000.md", "text")
+
+    assert cache.get(key) is None
+    cache.put(key, ["parsed"])
+    assert cache.get(key) == ["parsed"]
+
+
+def test_unusable_directory_disables_cache(tmp_path, capsys):
+    # A plain file where the cache directory should be
+    blocker = tmp_path / "cache"
+    blocker.write_text("", encoding="utf-8")
+
+    cache = TokenCache(blocker, salt=b"s")
+    key = cache.key_for("ECE000.md", "text")
+
+    assert not cache.enabled
+    assert "cache disabled" in capsys.readouterr().err
+    cache.put(key, ["parsed"])
+    cache.write_manifest({"ECE000.md": {"stat": [0, 0], "key": key}})
+    assert cache.get(key) is None
+    assert cache.read_manifest() == {}
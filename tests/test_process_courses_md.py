@@ -0,0 +1,117 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from process_courses_md import (  # noqa: E402
+    _process_one,
+    extract_course_header,
+    parse_markdown,
+    read_programme_details,
+)
+
+
+def _sample_course() -> str:
+    return (ROOT / "courses_md" / "ECE000.md").read_text(encoding="utf-8")
+
+
+def _programme_details():
+    return read_programme_details(ROOT / "assets" / "programme_details.md", "programme_details.md")
+
+
+def _integrated_course() -> str:
+    # ECE000's header, outcomes and mappings with 2-0-2-3-4 units that
+    # carry lab experiments and X-activity components
+    sample = _sample_course()
+    head = sample[:sample.index("## Unit 1")]
+    head = head.replace("L-T-P-X-C: 3-0-0-0-3", "L-T-P-X-C: 2-0-2-3-4")
+
+    units = []
+    for n in range(1, 6):
+        units.append(
+            f"## Unit {n}: Devices {n}\n"
+            "### Theory Content (6 Hours)\n"
+            "- Diodes: junction; bias\n"
+            "- Transistors: BJT; FET\n"
+            "- Amplifiers: gain; bandwidth\n"
+            "- Oscillators: feedback; stability\n"
+            "\n"
+            "### Laboratory Experiments (6 Hours)\n"
+            "#### Diode characteristics\n"
+            "Measure the V-I curve.\n"
+            "\n"
+            "- Forward bias\n"
+            "  - Record $V_f$\n"
+            "- Reverse bias\n"
+            "\n"
+            "#### Zener regulator\n"
+            "Build a shunt regulator.\n"
+            "\n"
+            "### X-Activity (9 Hours)\n"
+            "#### Survey\n"
+            "- Collect datasheets\n"
+            "  - Compare ratings\n"
+            "\n"
+            "Summarise findings.\n"
+            "\n"
+        )
+    return head + "".join(units)
+
+
+def test_body_index_stops_at_h3_before_first_h2():
+    # Course Objectives as an H3 sitting before the first H2
+    text = _sample_course().replace("## Course Objectives", "### Course Objectives")
+    tokens = parse_markdown(text)
+
+    *_, body_idx = extract_course_header(tokens, "ECE000.md")
+
+    assert tokens[body_idx].type == "heading_open"
+    assert tokens[body_idx].tag == "h3"
+    assert tokens[body_idx + 1].content == "Course Objectives"
+
+
+def test_h3_objectives_before_first_h2_are_kept():
+    text = _sample_course().replace("## Course Objectives", "### Course Objectives")
+
+    course, err = _process_one("ECE000.md", text, _programme_details())
+
+    assert err is None
+    assert course["objectives"] == [
+        "To understand energy band theory in solids",
+        "To analyze intrinsic and extrinsic semiconductors",
+        "To study carrier transport phenomena",
+    ]
+
+
+def test_lab_and_x_activity_descriptions_are_collected():
+    # Courses with described experiments/components used to hang build_course
+    course, err = _process_one("ECE900.md", _integrated_course(), _programme_details())
+
+    assert err is None
+    for unit in course["units"]:
+        assert unit["lab"]["experiments"] == [
+            {
+                "title": "Diode characteristics",
+                "description": [
+                    "Measure the V-I curve.",
+                    "- Forward bias",
+                    "- Record $V_f$",
+                    "- Reverse bias",
+                ],
+            },
+            {
+                "title": "Zener regulator",
+                "description": ["Build a shunt regulator."],
+            },
+        ]
+        assert unit["x"]["components"] == [
+            {
+                "title": "Survey",
+                "description": [
+                    "- Collect datasheets",
+                    "- Compare ratings",
+                    "Summarise findings.",
+                ],
+            },
+        ]
@@ -0,0 +1,42 @@
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from read_courses import _scan_sections_py  # noqa: E402
+
+_md_scan = pytest.importorskip("_md_scan")
+
+CASES = [
+    "",
+    "no headings at all\n",
+    "# Title\nbody\n## Sub\nmore\n",
+    "preamble\n# A\n#not a heading\n#   \n## B  \n  text  \n",
+    "# A\n```\n# inside code\n```\n## B\n",
+    "# A\n~~~~\n# inside\n~~~\n# still inside\n~~~~\n# B\n",
+    "# A\n```python\n# inside\n````\n```\n# B\n",
+    "###### Deep\n####### Seven\n# Über ünïcode\nβody\n",
+    "#\tTab\n#  nbsp\n#  Two spaces\n",
+]
+
+_PIECES = ["# ", "## ", "#", "```", "~~~", "````", "Title", "text", " ", "\t", "\n", "\n\n", "é"]
+
+
+def _fuzz_inputs(count=500, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 40)))
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_compiled_scanner_matches_python(text):
+    assert list(_md_scan.scan_sections(text)) == _scan_sections_py(text)
+
+
+def test_compiled_scanner_matches_python_fuzzed():
+    for text in _fuzz_inputs():
+        assert list(_md_scan.scan_sections(text)) == _scan_sections_py(text), text
@@ -0,0 +1,40 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from validate_structure import (  # noqa: E402
+    ContentShape,
+    MarkdownSection,
+    ValidationError,
+    validate_courses,
+)
+
+
+def _theory_course(hours_per_unit=9):
+    topics = "\n".join(f"- Topic {i}: detail" for i in range(1, 5))
+    sections = []
+    for n in range(1, 6):
+        sections.append(MarkdownSection(title=f"Unit {n}: Part {n}", body=""))
+        sections.append(MarkdownSection(title="Topics", body=f"{topics}\nTheory hours: {hours_per_unit}"))
+    return sections
+
+
+def test_validate_courses_accepts_valid_catalogue():
+    items = [(f"ECE{i:03d}", ContentShape.ACADEMIC_THEORY, _theory_course(), 45) for i in range(20)]
+    validate_courses(items)
+
+
+def test_validate_courses_raises_first_failure_in_input_order():
+    items = [(f"ECE{i:03d}", ContentShape.ACADEMIC_THEORY, _theory_course(), 45) for i in range(20)]
+    items[5] = ("ECE005", ContentShape.ACADEMIC_THEORY, _theory_course(), 40)
+    items[12] = ("ECE012", ContentShape.ACADEMIC_THEORY, _theory_course(hours_per_unit=0), 0)
+
+    with pytest.raises(ValidationError) as excinfo:
+        validate_courses(items)
+
+    assert excinfo.value.course_code == "ECE005"
+    assert excinfo.value.invariant_id == "AT-HOUR-MISMATCH"